@@ -0,0 +1,121 @@
+# backend/app/closures.py
+import threading
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import shapely
+from shapely.geometry import Polygon
+
+from .graph_loader import CampusGraph
+
+CLOSED = float("inf")
+
+
+@dataclass
+class Closure:
+    id: str
+    campus_key: str
+    rows: List[int]                  # edge rows in edges_df
+    penalty: Optional[float] = None  # None = closed outright, else extra cost on each edge
+    reason: Optional[str] = None
+    expires_at: Optional[datetime] = None
+    created_at: datetime = field(default_factory=datetime.now)
+
+    def expired(self) -> bool:
+        if self.expires_at is None:
+            return False
+        return datetime.now(self.expires_at.tzinfo) >= self.expires_at
+
+
+class ClosureOverlay:
+    """Sparse per-campus overlay of temporary closures and penalties.
+
+    `costs` maps edge row -> extra cost (CLOSED for a hard block) and is all the
+    router ever reads, so an unaffected edge costs one dict miss. `generation`
+    increases on every change, so a route computed across a change can be
+    recognized and kept out of the result cache. Hold `lock` to pair a change
+    with the cache update that goes with it.
+    """
+
+    def __init__(self, campus_key: str):
+        self.campus_key = campus_key
+        self.closures: Dict[str, Closure] = {}
+        self.costs: Dict[int, float] = {}
+        self.generation = 0
+        self.lock = threading.RLock()
+
+    def _rebuild(self) -> None:
+        costs: Dict[int, float] = {}
+        for c in self.closures.values():
+            extra = CLOSED if c.penalty is None else float(c.penalty)
+            for r in c.rows:
+                costs[r] = costs.get(r, 0.0) + extra  # closed wins, penalties stack
+        self.costs = costs  # swapped whole, so a running search keeps a consistent view
+        self.generation += 1
+
+    def add(self, closure: Closure) -> None:
+        with self.lock:
+            self.closures[closure.id] = closure
+            self._rebuild()
+
+    def remove(self, closure_id: str) -> Closure:
+        with self.lock:
+            closure = self.closures.pop(closure_id)
+            self._rebuild()
+            return closure
+
+    def purge_expired(self) -> List[Closure]:
+        with self.lock:
+            expired = [c for c in self.closures.values() if c.expired()]
+            if expired:
+                for c in expired:
+                    del self.closures[c.id]
+                self._rebuild()
+            return expired
+
+
+def new_closure_id() -> str:
+    return uuid.uuid4().hex[:12]
+
+
+# Edge selectors: each returns edge row indices in cg.edges_df
+
+def rows_for_node_pairs(cg: CampusGraph, pairs: Iterable[Tuple[int, int]]) -> List[int]:
+    # a closed path is closed both ways, so match either direction
+    edges = cg.edges_df
+    u = edges["u"].to_numpy(dtype=np.int64)
+    v = edges["v"].to_numpy(dtype=np.int64)
+    mask = np.zeros(len(edges), dtype=bool)
+    for a, b in pairs:
+        mask |= ((u == a) & (v == b)) | ((u == b) & (v == a))
+    return np.flatnonzero(mask).tolist()
+
+
+def rows_for_osm_ways(cg: CampusGraph, way_ids: Iterable[int]) -> List[int]:
+    edges = cg.edges_df
+    if "osmid" not in edges.columns:
+        raise ValueError("This campus graph has no OSM way ids; rebuild it with build_graph.py")
+    wanted = {int(w) for w in way_ids}
+    return [
+        i for i, ids in enumerate(edges["osmid"])
+        if ids is not None and wanted.intersection(int(w) for w in np.atleast_1d(ids))
+    ]
+
+
+def rows_in_polygon(cg: CampusGraph, ring: Sequence[Tuple[float, float]]) -> List[int]:
+    # ring is [(lat, lon), ...]; an edge is affected if its segment touches the polygon
+    if len(ring) < 3:
+        raise ValueError("Polygon needs at least 3 points")
+    poly = Polygon([(lon, lat) for lat, lon in ring])
+    if not poly.is_valid:
+        raise ValueError("Polygon is not valid (self-intersecting?)")
+    nodes = cg.nodes_df
+    lon = nodes["lon"].to_numpy(dtype=float)
+    lat = nodes["lat"].to_numpy(dtype=float)
+    iu = np.fromiter((cg.node_index[int(n)] for n in cg.edges_df["u"]), dtype=np.int64, count=len(cg.edges_df))
+    iv = np.fromiter((cg.node_index[int(n)] for n in cg.edges_df["v"]), dtype=np.int64, count=len(cg.edges_df))
+    segs = shapely.linestrings(np.stack([np.c_[lon[iu], lat[iu]], np.c_[lon[iv], lat[iv]]], axis=1))
+    return np.flatnonzero(shapely.intersects(poly, segs)).tolist()
@@ -3,13 +3,15 @@ import json
 import numpy as np
 import pandas as pd
 from dataclasses import dataclass
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 try:
     from scipy.spatial import cKDTree  # fast path
 except Exception:  # fallback if SciPy wheels not present on py3.13
     cKDTree = None
     from sklearn.neighbors import KDTree as SKKDTree  # type: ignore
 
+from .opening_hours import compile_windows
+
 @dataclass
 class CampusGraph:
     key: str
@@ -19,6 +21,10 @@ class CampusGraph:
     # store either cKDTree or sklearn KDTree in one attribute
     kdtree: Any
     node_index: Dict[int, int]  # node_id -> row index in nodes_df
+    # time windows, compiled once at load: edge row -> window id (-1 = always open),
+    # and window id -> bool[SLOTS_PER_WEEK]. None when no edge has restricted hours.
+    edge_window: Optional[np.ndarray] = None
+    windows: Optional[np.ndarray] = None
 
     def nearest_node(self, lat: float, lon: float) -> int:
         if cKDTree is not None and isinstance(self.kdtree, cKDTree):
@@ -42,4 +48,12 @@ def load_campus(prefix: str, key: str) -> CampusGraph:
         kdtree = SKKDTree(pts, leaf_size=40)
 
     node_index = {int(nid): i for i, nid in enumerate(nodes["node_id"].astype(int).to_numpy())}
-    return CampusGraph(key=key, nodes_df=nodes, edges_df=edges, meta=meta, kdtree=kdtree, node_index=node_index)
+
+    edge_window = windows = None
+    if "open_mask" in edges.columns:  # graphs built before opening hours have no column
+        edge_window, windows = compile_windows(edges["open_mask"])
+        if not (edge_window >= 0).any():
+            edge_window = windows = None  # nothing restricted: keep routing untimed
+
+    return CampusGraph(key=key, nodes_df=nodes, edges_df=edges, meta=meta, kdtree=kdtree, node_index=node_index,
+                       edge_window=edge_window, windows=windows)
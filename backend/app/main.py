@@ -1,12 +1,20 @@
 # backend/app/main.py
-from fastapi import FastAPI, HTTPException
+import math
+from datetime import datetime
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from pathlib import Path
-from typing import Dict
+from typing import Dict, List, Optional
 
-from .schemas import RouteRequest, RouteResponse, RouteTotals
+from .schemas import RouteRequest, RouteResponse, RouteTotals, ClosureRequest, ClosureResponse
 from .graph_loader import load_campus, CampusGraph
 from .routing import dijkstra_route
+from .closures import (
+    Closure, ClosureOverlay, new_closure_id, rows_for_node_pairs, rows_for_osm_ways, rows_in_polygon,
+)
+from .route_cache import RouteCache
+from .opening_hours import to_campus_time
+from .tiles import MAX_ZOOM, TileIndex, build_tile_index, get_tile
 
 app = FastAPI(title="Navigator API")
 app.add_middleware(
@@ -18,7 +26,11 @@ app.add_middleware(
 )
 
 DATA_DIR = Path("data/graphs")
+TILE_MAX_AGE_S = 300
 _cache: Dict[str, CampusGraph] = {}
+_tile_index: Dict[str, TileIndex] = {}
+_overlays: Dict[str, ClosureOverlay] = {}
+_route_cache: Dict[str, RouteCache] = {}
 
 def get_campus(campus_key: str) -> CampusGraph:
     if campus_key in _cache:
@@ -32,6 +44,30 @@ def get_campus(campus_key: str) -> CampusGraph:
     _cache[campus_key] = cg
     return cg
 
+def get_tile_index(campus_key: str) -> TileIndex:
+    if campus_key in _tile_index:
+        return _tile_index[campus_key]
+    idx = build_tile_index(get_campus(campus_key))
+    _tile_index[campus_key] = idx
+    return idx
+
+def get_overlay(campus_key: str) -> ClosureOverlay:
+    overlay = _overlays.setdefault(campus_key, ClosureOverlay(campus_key))
+    with overlay.lock:
+        if overlay.purge_expired():
+            # a reopened edge can improve any route, not just the ones that used it
+            get_route_cache(campus_key).clear()
+    return overlay
+
+def get_route_cache(campus_key: str) -> RouteCache:
+    return _route_cache.setdefault(campus_key, RouteCache())
+
+def closure_response(c: Closure, invalidated: int = 0) -> ClosureResponse:
+    return ClosureResponse(
+        id=c.id, campus_key=c.campus_key, edge_count=len(c.rows), penalty=c.penalty,
+        reason=c.reason, expires_at=c.expires_at, invalidated_routes=invalidated,
+    )
+
 @app.get("/healthz")
 def healthz():
     return {"status": "ok"}
@@ -39,7 +75,18 @@ def healthz():
 @app.post("/route", response_model=RouteResponse)
 def route(req: RouteRequest):
     cg = get_campus(req.campus_key)
+    overlay = get_overlay(req.campus_key)
+    cache = get_route_cache(req.campus_key)
+    cache_key = req.json()
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return cached
+    with overlay.lock:  # snapshot costs with the generation they belong to; see cache.put below
+        generation, costs = overlay.generation, overlay.costs
     try:
+        departure = None
+        if req.departure_time is not None and cg.edge_window is not None:  # no hours, nothing to check
+            departure = to_campus_time(req.departure_time, cg.meta.get("timezone"))
         src = cg.nearest_node(req.source.lat, req.source.lon)
         dst = cg.nearest_node(req.target.lat, req.target.lon)
         path_nodes, debug, steps = dijkstra_route(
@@ -54,6 +101,8 @@ def route(req: RouteRequest):
             avoid_stairs=req.prefs.avoid_stairs,
             prefer_indoor=req.prefs.prefer_indoor,
             max_distance_m=req.prefs.max_distance_m,
+            departure=departure,
+            overlay=costs,
         )
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -67,9 +116,78 @@ def route(req: RouteRequest):
         indoor_share=debug["indoor_share"],
     )
 
-    return {
+    resp = {
         "route": {"type": "LineString", "coordinates": coords},
         "steps": steps,
         "totals": totals.dict(),
         "meta": {"campus": req.campus_key, **cg.meta},
     }
+    # a closure posted mid-search already ran its invalidation; don't cache a stale route after it
+    with overlay.lock:
+        if overlay.generation == generation:
+            cache.put(cache_key, resp, debug["edge_rows"])
+    return resp
+
+@app.post("/closures", response_model=ClosureResponse)
+def add_closure(req: ClosureRequest):
+    cg = get_campus(req.campus_key)
+    try:
+        rows = set(rows_for_node_pairs(cg, [(e.u, e.v) for e in req.edges]))
+        if req.osm_ways:
+            rows.update(rows_for_osm_ways(cg, req.osm_ways))
+        if req.polygon:
+            rows.update(rows_in_polygon(cg, [(p.lat, p.lon) for p in req.polygon]))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not rows:
+        raise HTTPException(status_code=400, detail="Closure does not match any edges")
+    if req.penalty is not None and not (math.isfinite(req.penalty) and req.penalty >= 0):
+        raise HTTPException(status_code=400, detail="Penalty must be a finite, non-negative number")
+    if req.expires_at is not None and req.expires_at <= datetime.now(req.expires_at.tzinfo):
+        raise HTTPException(status_code=400, detail="expires_at is already in the past")
+
+    closure = Closure(
+        id=new_closure_id(), campus_key=req.campus_key, rows=sorted(rows),
+        penalty=req.penalty, reason=req.reason, expires_at=req.expires_at,
+    )
+    overlay = get_overlay(req.campus_key)
+    with overlay.lock:
+        overlay.add(closure)
+        # closures only make edges worse, so only cached routes over these edges can change
+        invalidated = get_route_cache(req.campus_key).invalidate_edges(closure.rows)
+    return closure_response(closure, invalidated)
+
+@app.get("/closures", response_model=List[ClosureResponse])
+def list_closures(campus_key: Optional[str] = None):
+    keys = [k for k in list(_overlays) if campus_key in (None, k)]
+    closures: List[Closure] = []
+    for k in keys:
+        overlay = get_overlay(k)
+        with overlay.lock:  # a concurrent POST/DELETE would otherwise mutate the dict mid-iteration
+            closures.extend(overlay.closures.values())
+    return [closure_response(c) for c in closures]
+
+@app.delete("/closures/{closure_id}", response_model=ClosureResponse)
+def delete_closure(closure_id: str):
+    for key, overlay in list(_overlays.items()):
+        with overlay.lock:
+            if closure_id in overlay.closures:
+                closure = overlay.remove(closure_id)
+                invalidated = get_route_cache(key).clear()
+                return closure_response(closure, invalidated)
+    raise HTTPException(status_code=404, detail=f"Closure '{closure_id}' not found")
+
+@app.get("/tiles/{campus}/{z}/{x}/{y}")
+def tiles(campus: str, z: int, x: int, y: int, request: Request):
+    if not (0 <= z <= MAX_ZOOM and 0 <= x < (1 << z) and 0 <= y < (1 << z)):
+        raise HTTPException(status_code=400, detail=f"Invalid tile coordinates {z}/{x}/{y}")
+    idx = get_tile_index(campus)
+    # the URL carries no version, so clients revalidate often and a rebuilt graph changes the ETag
+    headers = {"Cache-Control": f"public, max-age={TILE_MAX_AGE_S}", "ETag": f'"{idx.version}"'}
+    if request.headers.get("if-none-match") == headers["ETag"]:
+        return Response(status_code=304, headers=headers)
+    return Response(
+        content=get_tile(idx, z, x, y),
+        media_type="application/vnd.mapbox-vector-tile",
+        headers=headers,
+    )
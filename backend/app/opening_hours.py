@@ -0,0 +1,153 @@
+# backend/app/opening_hours.py
+import re
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+import numpy as np
+
+# A week is split into fixed slots; an edge's availability is one bit per slot.
+SLOT_MINUTES = 15
+SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES
+SLOTS_PER_WEEK = 7 * SLOTS_PER_DAY
+MINUTES_PER_WEEK = 7 * 24 * 60
+
+DAYS = ["Mo", "Tu", "We", "Th", "Fr", "Sa", "Su"]  # index == datetime.weekday()
+CLOSED_ACCESS = {"no", "private"}
+OPEN_ACCESS = {"yes", "permissive", "designated", "destination"}
+
+HOLIDAYS = {"PH", "SH"}  # public/school holidays: no calendar here, so those rules are ignored
+
+_DAY_RE = re.compile(r"^(Mo|Tu|We|Th|Fr|Sa|Su)(?:-(Mo|Tu|We|Th|Fr|Sa|Su))?$")
+# ", " followed by a day selector starts an additional rule ("Mo-Fr 08:00-18:00, Sa 10:00-14:00")
+_ADDITIONAL_RULE_RE = re.compile(r",\s+(?=(?:Mo|Tu|We|Th|Fr|Sa|Su|PH|SH)\b)")
+_SPAN_RE = re.compile(r"^(\d{1,2}):(\d{2})-(\d{1,2}):(\d{2})$")
+
+
+def _parse_days(spec: str) -> Iterable[int]:
+    days = []
+    for part in spec.split(","):
+        if part.strip() in HOLIDAYS:
+            continue
+        m = _DAY_RE.match(part.strip())
+        if not m:
+            raise ValueError(f"unsupported day selector '{part}'")
+        a = DAYS.index(m.group(1))
+        b = DAYS.index(m.group(2)) if m.group(2) else a
+        days.extend((a + i) % 7 for i in range((b - a) % 7 + 1))  # Fr-Mo wraps
+    return days
+
+
+def _set_span(week: np.ndarray, day: int, spec: str) -> None:
+    m = _SPAN_RE.match(spec.strip())
+    if not m:
+        raise ValueError(f"unsupported time span '{spec}'")
+    start = int(m.group(1)) * 60 + int(m.group(2))
+    end = int(m.group(3)) * 60 + int(m.group(4))
+    if start > 24 * 60 or end > 24 * 60:
+        raise ValueError(f"time out of range in '{spec}'")
+    if end <= start:
+        end += 24 * 60  # runs past midnight into the next day
+    first = day * SLOTS_PER_DAY + start // SLOT_MINUTES
+    last = day * SLOTS_PER_DAY + -(-end // SLOT_MINUTES)  # ceil: partially open slots count as open
+    week[np.arange(first, last) % SLOTS_PER_WEEK] = True
+
+
+def _is_day_selector(token: str) -> bool:
+    first = token.split(",")[0]
+    return first in HOLIDAYS or bool(_DAY_RE.match(first))
+
+
+def parse_opening_hours(value: str) -> Optional[np.ndarray]:
+    """Parse the common subset of OSM opening_hours into a weekly slot mask.
+
+    Handles '24/7', weekday selectors (Mo-Fr, Sa,Su, Fr-Mo), comma-separated
+    HH:MM-HH:MM spans, spans past midnight and 'off'/'closed'. Later ';' rules
+    replace earlier ones for the days they name, as in the OSM spec; ', '
+    additional rules add to them. PH/SH selectors are skipped.
+    Returns None for '24/7' (no restriction); raises ValueError otherwise.
+    """
+    value = value.strip()
+    if value == "24/7":
+        return None
+    week = np.zeros(SLOTS_PER_WEEK, dtype=bool)
+    rules = [
+        (rule.strip(), i > 0)
+        for group in value.split(";")
+        for i, rule in enumerate(_ADDITIONAL_RULE_RE.split(group))
+        if rule.strip()
+    ]
+    for rule, additional in rules:
+        head, _, rest = rule.partition(" ")
+        if _is_day_selector(head):
+            days, times = list(_parse_days(head)), rest.strip()
+            if not days:
+                continue  # holiday-only rule, e.g. "PH off"
+        else:
+            days, times = list(range(7)), rule
+        if not additional:
+            for d in days:
+                week[d * SLOTS_PER_DAY:(d + 1) * SLOTS_PER_DAY] = False
+        if times in {"off", "closed"}:
+            continue
+        if times in {"", "24/7", "00:00-24:00"}:
+            for d in days:
+                week[d * SLOTS_PER_DAY:(d + 1) * SLOTS_PER_DAY] = True
+            continue
+        for d in days:
+            for span in times.split(","):
+                _set_span(week, d, span)
+    return week
+
+
+def edge_open_mask(tags: Dict[str, Any]) -> Optional[bytes]:
+    # Packed weekly availability for an edge, or None if it is always usable.
+    foot = str(tags.get("foot") or "").lower()
+    access = str(tags.get("access") or "").lower()
+    if foot in CLOSED_ACCESS or (access in CLOSED_ACCESS and foot not in OPEN_ACCESS):
+        return np.packbits(np.zeros(SLOTS_PER_WEEK, dtype=bool)).tobytes()
+
+    hours = tags.get("opening_hours")
+    if not hours:
+        return None
+    try:
+        week = parse_opening_hours(str(hours))
+    except ValueError:
+        return None  # unparseable hours: keep today's behaviour rather than strand routes
+    return None if week is None else np.packbits(week).tobytes()
+
+
+def compile_windows(masks: Iterable[Optional[bytes]]) -> Tuple[np.ndarray, np.ndarray]:
+    """Turn per-edge packed masks into (window_id per edge, unpacked window table).
+
+    window_id is -1 for unrestricted edges. Identical masks (e.g. every edge
+    of one building) share a row, so the table stays small.
+    """
+    ids: Dict[bytes, int] = {}
+    window_id = []
+    for m in masks:
+        if m is None or (isinstance(m, float) and np.isnan(m)):
+            window_id.append(-1)
+            continue
+        window_id.append(ids.setdefault(bytes(m), len(ids)))
+    table = np.zeros((len(ids), SLOTS_PER_WEEK), dtype=bool)
+    for m, i in ids.items():
+        table[i] = np.unpackbits(np.frombuffer(m, dtype=np.uint8))[:SLOTS_PER_WEEK].astype(bool)
+    return np.asarray(window_id, dtype=np.int32), table
+
+
+def to_campus_time(t: datetime, tz_name: Optional[str]) -> datetime:
+    # naive times are taken as campus-local wall clock; aware ones are converted
+    if t.tzinfo is None:
+        return t
+    if not tz_name:
+        raise ValueError("Campus graph has no timezone; send a local time without offset or rebuild the graph")
+    try:
+        return t.astimezone(ZoneInfo(tz_name))
+    except ZoneInfoNotFoundError:
+        raise ValueError(f"Unknown campus timezone '{tz_name}'")
+
+
+def minute_of_week(t: datetime) -> float:
+    # wall-clock time as given; callers convert with to_campus_time first
+    return t.weekday() * 24 * 60 + t.hour * 60 + t.minute + t.second / 60.0
@@ -0,0 +1,69 @@
+# backend/app/route_cache.py
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+
+
+class RouteCache:
+    """Per-campus LRU of /route responses, indexed by the edges each route uses.
+
+    Closures only ever make edges more expensive, so a new closure can only
+    invalidate routes that run over one of its edges; those are found through
+    the reverse index instead of flushing everything. FastAPI runs the sync
+    handlers in a threadpool, so every operation takes the lock.
+    """
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[Dict[str, Any], Tuple[int, ...]]]" = OrderedDict()
+        self._by_edge: Dict[int, Set[str]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            hit = self._entries.get(key)
+            if hit is None:
+                return None
+            self._entries.move_to_end(key)
+            return hit[0]
+
+    def put(self, key: str, value: Dict[str, Any], edge_rows: Iterable[int]) -> None:
+        rows = tuple(set(edge_rows))
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (value, rows)
+            for r in rows:
+                self._by_edge.setdefault(r, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._drop(next(iter(self._entries)))
+
+    def _drop(self, key: str) -> None:
+        # caller holds the lock
+        _, rows = self._entries.pop(key)
+        for r in rows:
+            keys = self._by_edge.get(r)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_edge[r]
+
+    def invalidate_edges(self, edge_rows: Iterable[int]) -> int:
+        with self._lock:
+            stale: Set[str] = set()
+            for r in edge_rows:
+                stale |= self._by_edge.get(r, set())
+            for key in stale:
+                self._drop(key)
+            return len(stale)
+
+    def clear(self) -> int:
+        with self._lock:
+            n = len(self._entries)
+            self._entries.clear()
+            self._by_edge.clear()
+            return n
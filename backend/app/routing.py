@@ -1,9 +1,13 @@
 import heapq
+from datetime import datetime
 from typing import Any, Dict, List, Tuple, Optional
 import numpy as np
 import pandas as pd
 
 from .graph_loader import CampusGraph
+from .opening_hours import SLOT_MINUTES, SLOTS_PER_WEEK, minute_of_week
+
+WALK_SPEED_MPS = 1.4
 
 # Cost model helpers
 
@@ -27,6 +31,16 @@ def edge_cost(row: pd.Series, lam: Dict[str, float], avoid_stairs: bool, prefer_
 
     return cost
 
+def _wait_minutes(window: np.ndarray, t_min: float) -> float:
+    # Minutes until the window is open at week-minute t_min: 0 if open now, inf if never.
+    slot = int(t_min // SLOT_MINUTES) % SLOTS_PER_WEEK
+    if window[slot]:
+        return 0.0
+    ahead = np.flatnonzero(np.roll(window, -slot))  # only scanned for closed edges
+    if ahead.size == 0:
+        return float("inf")
+    return ahead[0] * SLOT_MINUTES - (t_min % SLOT_MINUTES)
+
 def build_adjacency(edges_df: pd.DataFrame) -> Dict[int, List[Tuple[int, int]]]:
     # adjacency: u -> list of (row_index, v)
     adj: Dict[int, List[Tuple[int, int]]] = {}
@@ -44,18 +58,38 @@ def dijkstra_route(
     avoid_stairs: bool,
     prefer_indoor: bool,
     max_distance_m: Optional[float] = None,
-) -> Tuple[List[int], Dict[str, float], List[Dict[str, Any]]]:
+    departure: Optional[datetime] = None,
+    walk_speed_mps: float = WALK_SPEED_MPS,
+    overlay: Optional[Dict[int, float]] = None,
+) -> Tuple[List[int], Dict[str, Any], List[Dict[str, Any]]]:
     edges = cg.edges_df
     adj = build_adjacency(edges)
 
+    # Time-dependent mode: an edge is usable only while it is open. A walker who reaches a
+    # closed edge waits for its next open slot, so arriving earlier is never worse and one
+    # label per node stays enough. Waiting is charged at the walking rate (1 min ~ 84 m)
+    # so a short wait can beat a detour but a long one rarely does. No departure, or a
+    # graph without restricted edges (edge_window is None) -> ignore hours.
+    timed = departure is not None and cg.edge_window is not None
+    if timed:
+        edge_window = cg.edge_window
+        windows = cg.windows
+        t0_min = minute_of_week(departure)
+        walk_m_per_min = walk_speed_mps * 60.0
+
+    # Closures overlay: edge row -> extra cost (inf = closed). Sparse, so most edges miss.
+    overlay = overlay or {}
+
     INF = float("inf")
     dist_cost: Dict[int, float] = {}
     dist_phys: Dict[int, float] = {}
+    dist_time: Dict[int, float] = {}  # minutes since departure, walking plus waiting
     prev_edge_row: Dict[int, int] = {}
 
     pq: List[Tuple[float, int]] = []
     dist_cost[src] = 0.0
     dist_phys[src] = 0.0
+    dist_time[src] = 0.0
     heapq.heappush(pq, (0.0, src))
 
     while pq:
@@ -65,23 +99,39 @@ def dijkstra_route(
         if d != dist_cost.get(u, INF):
             continue
         for row_idx, v in adj.get(u, []):
+            wait = 0.0
+            if timed:
+                wid = edge_window[row_idx]
+                if wid >= 0:
+                    wait = _wait_minutes(windows[wid], t0_min + dist_time[u])
+                    if wait == INF:
+                        continue  # never open (e.g. access=private)
+            extra = overlay.get(row_idx, 0.0)
+            if extra == INF:
+                continue  # closed by facilities
             row = edges.iloc[row_idx]
             w = edge_cost(row, lam, avoid_stairs, prefer_indoor)
             if not np.isfinite(w):
                 continue
+            w += extra
+            distance_m = float(row["distance_m"])
+            if wait:
+                w += wait * walk_m_per_min
             nd_cost = d + w
-            nd_phys = dist_phys[u] + float(row["distance_m"])
+            nd_phys = dist_phys[u] + distance_m
             if max_distance_m is not None and nd_phys > max_distance_m:
                 continue
             if nd_cost < dist_cost.get(v, INF):
                 dist_cost[v] = nd_cost
                 dist_phys[v] = nd_phys
+                if timed:
+                    dist_time[v] = dist_time[u] + wait + distance_m / walk_m_per_min
                 prev_edge_row[v] = row_idx
                 heapq.heappush(pq, (nd_cost, v))
 
     if dst not in dist_cost:
         raise ValueError("No feasible route found with given preferences")
-    
+
     # Reconstruct path of node_ids and traverse edges
     path_nodes_rev: List[int] = [dst]
     path_edge_rows_rev: List[int] = []
@@ -131,5 +181,7 @@ def dijkstra_route(
         "total_distance_m": total_dist,
         "stairs_edges": stairs_edges,
         "indoor_share": indoor_share,
+        "edge_rows": path_edge_rows,
+        "wait_min": dist_time[dst] - total_dist / (walk_speed_mps * 60.0) if timed else 0.0,
     }
     return path_nodes, debug, steps
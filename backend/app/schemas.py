@@ -1,3 +1,4 @@
+from datetime import datetime
 from pydantic import BaseModel, Field
 from typing import List, Optional, Dict
 
@@ -21,6 +22,9 @@ class RouteRequest(BaseModel):
     source: LatLon
     target: LatLon
     prefs: Prefs
+    # ISO time with offset (converted to the campus timezone) or naive campus-local time;
+    # when set, edges outside their opening hours are skipped
+    departure_time: Optional[datetime] = None
 
 class Step(BaseModel):
     from_node: int
@@ -37,4 +41,27 @@ class RouteResponse(BaseModel):
     route: Dict
     steps: List[Step]
     totals: RouteTotals
-    meta: Dict
\ No newline at end of file
+    meta: Dict
+
+class EdgeRef(BaseModel):
+    u: int
+    v: int
+
+class ClosureRequest(BaseModel):
+    campus_key: str
+    # any combination of selectors; the closure covers the union
+    edges: List[EdgeRef] = []
+    osm_ways: List[int] = []
+    polygon: Optional[List[LatLon]] = None
+    penalty: Optional[float] = None  # omitted = closed; otherwise added to each edge's cost
+    reason: Optional[str] = None
+    expires_at: Optional[datetime] = None
+
+class ClosureResponse(BaseModel):
+    id: str
+    campus_key: str
+    edge_count: int
+    penalty: Optional[float] = None
+    reason: Optional[str] = None
+    expires_at: Optional[datetime] = None
+    invalidated_routes: int = 0
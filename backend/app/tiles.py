@@ -0,0 +1,177 @@
+# backend/app/tiles.py
+import hashlib
+import math
+import os
+import tempfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+import mapbox_vector_tile
+import shapely
+from shapely.geometry import LineString, box
+from shapely.ops import linemerge
+from shapely.strtree import STRtree
+
+from .graph_loader import CampusGraph
+
+TILE_CACHE_DIR = Path("cache/tiles")
+TILE_EXTENT = 4096
+TILE_PX = 256                  # nominal on-screen tile size
+TILE_BUFFER_PX = 4             # clip margin so lines don't end exactly at tile seams
+MIN_ZOOM = 12                  # below this a campus is a few pixels wide: serve empty tiles
+DETAIL_ZOOM = 16               # at/above this edges are served as-is
+MAX_ZOOM = 20                  # deepest tile we serve; beyond this is sub-centimeter detail
+SIMPLIFY_PX = 1.0              # Douglas-Peucker tolerance in screen pixels
+
+LAYER_NAME = "edges"
+EDGE_PROPS = ("is_stairs", "is_covered_or_indoor")
+
+# Web Mercator (EPSG:3857)
+_R = 6378137.0
+_ORIGIN = math.pi * _R         # half the world width in meters
+
+
+def lonlat_to_mercator(lon: np.ndarray, lat: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    x = np.radians(lon) * _R
+    lat = np.clip(lat, -85.05112878, 85.05112878)
+    y = np.log(np.tan(np.pi / 4 + np.radians(lat) / 2)) * _R
+    return x, y
+
+
+def tile_bounds(z: int, x: int, y: int) -> Tuple[float, float, float, float]:
+    size = 2 * _ORIGIN / (1 << z)
+    minx = -_ORIGIN + x * size
+    maxy = _ORIGIN - y * size
+    return minx, maxy - size, minx + size, maxy
+
+
+def meters_per_pixel(z: int) -> float:
+    return 2 * _ORIGIN / (1 << z) / TILE_PX
+
+
+@dataclass
+class _Layer:
+    geoms: List[Any]
+    props: List[Dict[str, bool]]
+    tree: STRtree
+
+
+@dataclass
+class TileIndex:
+    key: str
+    version: str
+    detail: _Layer
+    bounds: Tuple[float, float, float, float]  # mercator extent of all edges
+    # generalized layers, built lazily per zoom below DETAIL_ZOOM
+    generalized: Dict[int, _Layer] = field(default_factory=dict)
+
+    def layer_for_zoom(self, z: int) -> _Layer:
+        if z >= DETAIL_ZOOM:
+            return self.detail
+        if z not in self.generalized:
+            self.generalized[z] = _generalize(self.detail, meters_per_pixel(z) * SIMPLIFY_PX)
+        return self.generalized[z]
+
+
+def _generalize(detail: _Layer, tolerance_m: float) -> _Layer:
+    # merge connected edges sharing the same properties, then simplify the merged lines
+    groups: Dict[Tuple[bool, ...], List[Any]] = {}
+    for g, p in zip(detail.geoms, detail.props):
+        groups.setdefault(tuple(p[k] for k in EDGE_PROPS), []).append(g)
+
+    geoms: List[Any] = []
+    props: List[Dict[str, bool]] = []
+    for flags, lines in groups.items():
+        merged = linemerge(lines)
+        parts = list(merged.geoms) if hasattr(merged, "geoms") else [merged]
+        for part in parts:
+            if part.length < tolerance_m:
+                continue  # sub-pixel fragment
+            geoms.append(part.simplify(tolerance_m, preserve_topology=False))
+            props.append(dict(zip(EDGE_PROPS, flags)))
+    return _Layer(geoms=geoms, props=props, tree=STRtree(geoms))
+
+
+def build_tile_index(cg: CampusGraph) -> TileIndex:
+    nodes = cg.nodes_df
+    mx, my = lonlat_to_mercator(nodes["lon"].to_numpy(dtype=float), nodes["lat"].to_numpy(dtype=float))
+    edges = cg.edges_df
+
+    # both directions of a footway are stored; draw each pair of nodes once
+    seen = set()
+    geoms: List[Any] = []
+    props: List[Dict[str, bool]] = []
+    for u, v, stairs, covered in zip(
+        edges["u"].astype(int), edges["v"].astype(int),
+        edges["is_stairs"].astype(bool), edges["is_covered_or_indoor"].astype(bool),
+    ):
+        pair = (min(u, v), max(u, v), bool(stairs), bool(covered))
+        if pair in seen:
+            continue
+        seen.add(pair)
+        iu = cg.node_index[u]; iv = cg.node_index[v]
+        geoms.append(LineString([(mx[iu], my[iu]), (mx[iv], my[iv])]))
+        props.append({"is_stairs": bool(stairs), "is_covered_or_indoor": bool(covered)})
+
+    # generated_at changes whenever build_graph.py rewrites the artifacts
+    stamp = str(cg.meta.get("generated_at", "")) + str(len(edges))
+    version = hashlib.sha1(stamp.encode()).hexdigest()[:12]
+    bounds = tuple(float(b) for b in shapely.total_bounds(geoms)) if geoms else (0.0, 0.0, 0.0, 0.0)
+    return TileIndex(key=cg.key, version=version, detail=_Layer(geoms, props, STRtree(geoms)), bounds=bounds)
+
+
+def _encode(features: List[Dict[str, Any]], bounds: Tuple[float, float, float, float]) -> bytes:
+    return mapbox_vector_tile.encode(
+        [{"name": LAYER_NAME, "features": features}],
+        default_options={"quantize_bounds": bounds, "extents": TILE_EXTENT},
+    )
+
+
+# one shared body for every tile with nothing to draw; never written to disk
+EMPTY_TILE = _encode([], tile_bounds(0, 0, 0))
+
+
+def covers_campus(index: TileIndex, z: int, x: int, y: int) -> bool:
+    if z < MIN_ZOOM or not index.detail.geoms:
+        return False
+    minx, miny, maxx, maxy = tile_bounds(z, x, y)
+    pad = meters_per_pixel(z) * TILE_BUFFER_PX
+    bx0, by0, bx1, by1 = index.bounds
+    return minx - pad <= bx1 and maxx + pad >= bx0 and miny - pad <= by1 and maxy + pad >= by0
+
+
+def render_tile(index: TileIndex, z: int, x: int, y: int) -> bytes:
+    bounds = tile_bounds(z, x, y)
+    features = []
+    if covers_campus(index, z, x, y):
+        layer = index.layer_for_zoom(z)
+        pad = meters_per_pixel(z) * TILE_BUFFER_PX
+        clip = box(bounds[0] - pad, bounds[1] - pad, bounds[2] + pad, bounds[3] + pad)
+        for i in layer.tree.query(clip):
+            geom = layer.geoms[int(i)].intersection(clip)
+            if geom.is_empty:
+                continue
+            features.append({"geometry": geom, "properties": layer.props[int(i)]})
+    return _encode(features, bounds)
+
+
+def tile_cache_path(index: TileIndex, z: int, x: int, y: int) -> Path:
+    return TILE_CACHE_DIR / index.key / index.version / str(z) / str(x) / f"{y}.mvt"
+
+
+def get_tile(index: TileIndex, z: int, x: int, y: int) -> bytes:
+    # only tiles over the campus are cached, so arbitrary requests can't fill the disk
+    if not covers_campus(index, z, x, y):
+        return EMPTY_TILE
+    path = tile_cache_path(index, z, x, y)
+    if path.exists():
+        return path.read_bytes()
+    data = render_tile(index, z, x, y)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # unique temp file per writer: handlers run in a threadpool and may render the same tile at once
+    with tempfile.NamedTemporaryFile(dir=path.parent, suffix=".tmp", delete=False) as tmp:
+        tmp.write(data)
+    os.replace(tmp.name, path)  # atomic, so concurrent readers never see a partial tile
+    return data
@@ -0,0 +1,50 @@
+# backend/tests/conftest.py
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+from scipy.spatial import cKDTree
+
+from backend.app.graph_loader import CampusGraph
+
+
+@pytest.fixture
+def make_graph():
+    def _graph(nodes_df: pd.DataFrame, edges_df: pd.DataFrame, meta=None) -> CampusGraph:
+        meta = meta or {"campus_key": "test"}
+        coords = np.c_[nodes_df["lat"], nodes_df["lon"]]
+        kdtree = cKDTree(coords)
+        node_index = {int(row.node_id): idx for idx, row in nodes_df.reset_index(drop=True).iterrows()}
+        return CampusGraph("test", nodes_df, edges_df, meta, kdtree, node_index)
+    return _graph
+
+
+@pytest.fixture
+def api(tmp_path, monkeypatch):
+    """TestClient over a small on-disk campus 'demo' in a temp data dir.
+
+    Nodes 1-2-3 lie on a line (ways 10 and 20, 85 m each), with a 400 m
+    detour 1-3 (way 99) and a spur 3-4 (way 30) that no route between
+    1 and 3 uses.
+    """
+    from fastapi.testclient import TestClient
+    from backend.app import main, tiles
+
+    graphs = tmp_path / "graphs"
+    graphs.mkdir()
+    nodes = pd.DataFrame([{"node_id": i, "lat": 39.95, "lon": -75.19 + i * 0.001} for i in (1, 2, 3, 4)])
+    rows = []
+    for u, v, dist, way in [(1, 2, 85.0, 10), (2, 3, 85.0, 20), (1, 3, 400.0, 99), (3, 4, 85.0, 30)]:
+        for a, b in [(u, v), (v, u)]:
+            rows.append({"u": a, "v": b, "distance_m": dist, "is_stairs": False, "is_covered_or_indoor": False,
+                         "surface_penalty": 0.6, "osmid": [way]})
+    nodes.to_parquet(graphs / "demo.nodes.parquet", index=False)
+    pd.DataFrame(rows).to_parquet(graphs / "demo.edges.parquet", index=False)
+    (graphs / "demo.meta.json").write_text(json.dumps({"campus_key": "demo", "generated_at": "2025-01-01T00:00:00Z"}))
+
+    monkeypatch.setattr(main, "DATA_DIR", graphs)
+    monkeypatch.setattr(tiles, "TILE_CACHE_DIR", tmp_path / "tiles")
+    for registry in ("_cache", "_tile_index", "_overlays", "_route_cache"):
+        monkeypatch.setattr(main, registry, {})
+    return TestClient(main.app)
@@ -0,0 +1,153 @@
+# backend/tests/test_closures.py
+from datetime import datetime, timedelta
+
+import pandas as pd
+import pytest
+
+from backend.app.closures import (
+    CLOSED,
+    Closure,
+    ClosureOverlay,
+    rows_for_node_pairs,
+    rows_for_osm_ways,
+    rows_in_polygon,
+)
+from backend.app.route_cache import RouteCache
+
+
+@pytest.fixture
+def line(make_graph):
+    nodes = pd.DataFrame([
+        {"node_id": 1, "lat": 0.0, "lon": 0.0},
+        {"node_id": 2, "lat": 0.0, "lon": 1.0},
+        {"node_id": 3, "lat": 0.0, "lon": 2.0},
+    ])
+    edges = pd.DataFrame([
+        {"u": 1, "v": 2, "osmid": [10]},
+        {"u": 2, "v": 1, "osmid": [10]},
+        {"u": 2, "v": 3, "osmid": [20, 21]},
+        {"u": 3, "v": 2, "osmid": [20, 21]},
+    ])
+    return make_graph(nodes, edges)
+
+
+def test_selectors_match_both_directions(line):
+    cg = line
+
+    assert rows_for_node_pairs(cg, [(2, 1)]) == [0, 1]
+    assert rows_for_osm_ways(cg, [21]) == [2, 3]
+    # a box around node 3 only catches the edge that ends there
+    box = [(-0.5, 1.5), (-0.5, 2.5), (0.5, 2.5), (0.5, 1.5)]
+    assert rows_in_polygon(cg, box) == [2, 3]
+
+
+def test_osm_way_selector_needs_way_ids(line):
+    cg = line
+    cg.edges_df = cg.edges_df.drop(columns=["osmid"])
+    with pytest.raises(ValueError):
+        rows_for_osm_ways(cg, [10])
+
+
+def test_overlay_stacks_penalties_and_drops_expired_closures():
+    overlay = ClosureOverlay("test")
+    overlay.add(Closure(id="a", campus_key="test", rows=[0, 1], penalty=25.0))
+    overlay.add(Closure(id="b", campus_key="test", rows=[1], penalty=10.0))
+    overlay.add(Closure(id="c", campus_key="test", rows=[2], expires_at=datetime.now() - timedelta(minutes=1)))
+
+    assert overlay.costs == {0: 25.0, 1: 35.0, 2: CLOSED}
+    assert [c.id for c in overlay.purge_expired()] == ["c"]
+    assert overlay.costs == {0: 25.0, 1: 35.0}
+
+    overlay.remove("a")
+    assert overlay.costs == {1: 10.0}
+
+
+def test_route_cache_invalidates_only_routes_over_changed_edges():
+    cache = RouteCache(max_entries=2)
+    cache.put("r1", {"id": 1}, [0, 1])
+    cache.put("r2", {"id": 2}, [2])
+
+    assert cache.invalidate_edges([1]) == 1
+    assert cache.get("r1") is None
+    assert cache.get("r2") == {"id": 2}
+
+    cache.put("r3", {"id": 3}, [3])
+    cache.put("r4", {"id": 4}, [4])  # evicts r2, the least recently used
+    assert cache.get("r2") is None
+    assert cache.invalidate_edges([2]) == 0
+    assert len(cache) == 2
+
+
+def test_overlay_generation_moves_on_every_change():
+    overlay = ClosureOverlay("test")
+    g0 = overlay.generation
+    overlay.add(Closure(id="a", campus_key="test", rows=[0]))
+    g1 = overlay.generation
+    overlay.remove("a")
+
+    assert g0 < g1 < overlay.generation
+
+
+ROUTE_1_TO_3 = {
+    "campus_key": "demo",
+    "source": {"lat": 39.95, "lon": -75.189},
+    "target": {"lat": 39.95, "lon": -75.187},
+    "prefs": {},
+}
+
+
+def _cached_routes(campus_key: str = "demo") -> int:
+    from backend.app import main
+    return len(main.get_route_cache(campus_key))
+
+
+def test_closure_on_route_edge_evicts_cached_route(api):
+    assert api.post("/route", json=ROUTE_1_TO_3).json()["totals"]["distance_m"] == pytest.approx(170.0)
+    assert _cached_routes() == 1
+
+    r = api.post("/closures", json={"campus_key": "demo", "osm_ways": [20], "reason": "construction"})
+    assert r.status_code == 200
+    assert r.json()["edge_count"] == 2
+    assert r.json()["invalidated_routes"] == 1
+    assert _cached_routes() == 0
+
+    assert api.post("/route", json=ROUTE_1_TO_3).json()["totals"]["distance_m"] == pytest.approx(400.0)
+
+
+def test_closure_on_unrelated_edge_keeps_cached_route(api):
+    api.post("/route", json=ROUTE_1_TO_3)
+
+    r = api.post("/closures", json={"campus_key": "demo", "edges": [{"u": 4, "v": 3}], "penalty": 100.0})
+    assert r.json()["invalidated_routes"] == 0
+    assert _cached_routes() == 1
+    assert [c["id"] for c in api.get("/closures", params={"campus_key": "demo"}).json()] == [r.json()["id"]]
+
+
+def test_deleting_closure_clears_route_cache(api):
+    closure = api.post("/closures", json={"campus_key": "demo", "edges": [{"u": 3, "v": 4}]}).json()
+    api.post("/route", json=ROUTE_1_TO_3)
+    assert _cached_routes() == 1
+
+    r = api.delete(f"/closures/{closure['id']}")
+    assert r.status_code == 200
+    assert r.json()["invalidated_routes"] == 1
+    assert _cached_routes() == 0
+    assert api.get("/closures").json() == []
+    assert api.delete(f"/closures/{closure['id']}").status_code == 404
+
+
+def test_closure_must_match_edges(api):
+    assert api.post("/closures", json={"campus_key": "demo", "osm_ways": [12345]}).status_code == 400
+    assert api.post("/closures", json={"campus_key": "demo", "edges": [{"u": 1, "v": 2}], "penalty": -1}).status_code == 400
+
+
+def test_closure_rejects_non_finite_penalty_and_past_expiry(api):
+    edge = [{"u": 1, "v": 2}]
+    for bad in ("NaN", "Infinity"):
+        body = '{"campus_key": "demo", "edges": [{"u": 1, "v": 2}], "penalty": %s}' % bad
+        r = api.post("/closures", content=body, headers={"Content-Type": "application/json"})
+        assert r.status_code == 400
+
+    past = (datetime.now() - timedelta(minutes=5)).isoformat()
+    assert api.post("/closures", json={"campus_key": "demo", "edges": edge, "expires_at": past}).status_code == 400
+    assert api.get("/closures").json() == []
@@ -0,0 +1,107 @@
+# backend/tests/test_opening_hours.py
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.app.graph_loader import load_campus
+from backend.app.opening_hours import (
+    SLOT_MINUTES,
+    SLOTS_PER_DAY,
+    compile_windows,
+    edge_open_mask,
+    parse_opening_hours,
+    to_campus_time,
+)
+
+
+def _slot(day: int, hour: int, minute: int = 0) -> int:
+    return day * SLOTS_PER_DAY + (hour * 60 + minute) // SLOT_MINUTES
+
+
+def test_weekday_rules_and_off_days():
+    week = parse_opening_hours("Mo-Fr 08:00-18:00; Sa 10:00-14:00; Su off")
+
+    assert week[_slot(0, 8)] and week[_slot(4, 17, 45)]
+    assert not week[_slot(0, 7, 45)] and not week[_slot(0, 18)]
+    assert week[_slot(5, 12)] and not week[_slot(5, 15)]
+    assert not week[_slot(6, 12)]
+
+
+def test_span_past_midnight_wraps_into_next_day_and_week():
+    week = parse_opening_hours("Su 22:00-02:00")
+
+    assert week[_slot(6, 23)]
+    assert week[_slot(0, 1, 45)]  # Monday morning of the next week
+    assert not week[_slot(0, 2)]
+
+
+def test_always_open_and_unparseable_values_are_unrestricted():
+    assert parse_opening_hours("24/7") is None
+    assert edge_open_mask({"opening_hours": "24/7"}) is None
+    assert edge_open_mask({"opening_hours": "sunrise-sunset"}) is None
+    with pytest.raises(ValueError):
+        parse_opening_hours("sunrise-sunset")
+
+
+def test_private_access_is_always_closed_unless_foot_allowed():
+    closed = edge_open_mask({"access": "private"})
+    assert closed is not None and not any(closed)
+    assert edge_open_mask({"access": "private", "foot": "yes"}) is None
+
+
+def test_compile_windows_shares_identical_masks():
+    mask = edge_open_mask({"opening_hours": "Mo-Fr 08:00-18:00"})
+    window_id, table = compile_windows([None, mask, mask, None])
+
+    assert window_id.tolist() == [-1, 0, 0, -1]
+    assert table.shape[0] == 1
+    assert np.count_nonzero(table[0]) == 5 * 10 * 60 // SLOT_MINUTES
+
+
+def test_aware_departures_are_converted_to_campus_time():
+    t = datetime(2025, 1, 9, 4, 0, tzinfo=timezone.utc)
+    local = to_campus_time(t, "America/New_York")
+    assert (local.weekday(), local.hour) == (2, 23)  # Wednesday 23:00 in Philadelphia
+
+    naive = datetime(2025, 1, 8, 23, 0)
+    assert to_campus_time(naive, None) is naive
+    with pytest.raises(ValueError):
+        to_campus_time(t, None)
+
+
+def test_holiday_rules_are_ignored():
+    week = parse_opening_hours("Mo-Fr 08:00-18:00; PH off")
+    assert week is not None
+    assert week[_slot(2, 12)] and not week[_slot(2, 23)]
+    assert not week[_slot(5, 12)]
+
+    week = parse_opening_hours("Sa,PH 10:00-14:00")
+    assert week[_slot(5, 11)] and not week[_slot(4, 11)]
+
+
+def test_comma_separated_additional_rules():
+    week = parse_opening_hours("Mo-Fr 08:00-18:00, Sa 10:00-14:00")
+    assert week[_slot(0, 9)] and week[_slot(5, 11)]
+    assert not week[_slot(5, 15)] and not week[_slot(6, 11)]
+
+    # commas between spans still belong to the same rule
+    week = parse_opening_hours("Mo,We 08:00-12:00,13:00-17:00")
+    assert week[_slot(2, 14)] and not week[_slot(2, 12, 30)] and not week[_slot(1, 9)]
+
+
+def test_graph_without_restricted_edges_loads_untimed(tmp_path):
+    nodes = pd.DataFrame([{"node_id": 1, "lat": 0.0, "lon": 0.0}, {"node_id": 2, "lat": 0.0, "lon": 1.0}])
+    edges = pd.DataFrame([{"u": 1, "v": 2, "distance_m": 10.0, "open_mask": None}])
+    nodes.to_parquet(tmp_path / "c.nodes.parquet")
+    edges.to_parquet(tmp_path / "c.edges.parquet")
+    (tmp_path / "c.meta.json").write_text("{}")
+
+    cg = load_campus(str(tmp_path / "c"), "c")
+    assert cg.edge_window is None and cg.windows is None
+
+    edges["open_mask"] = [edge_open_mask({"opening_hours": "Mo-Fr 08:00-18:00"})]
+    edges.to_parquet(tmp_path / "c.edges.parquet")
+    cg = load_campus(str(tmp_path / "c"), "c")
+    assert cg.edge_window.tolist() == [0]
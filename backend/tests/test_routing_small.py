@@ -1,10 +1,13 @@
 # backend/tests/test_routing_small.py
+from datetime import datetime
+
 import numpy as np
 import pandas as pd
 import pytest
 from scipy.spatial import cKDTree
 
 from backend.app.graph_loader import CampusGraph
+from backend.app.opening_hours import compile_windows, edge_open_mask
 from backend.app.routing import dijkstra_route
 
 
@@ -94,3 +97,117 @@ def test_distance_cap_applies_to_physical_distance_only():
 
     with pytest.raises(ValueError):
         dijkstra_route(cg, 1, 3, lam, False, True, max_distance_m=200.0)
+
+
+def test_closed_indoor_edge_is_skipped_outside_opening_hours():
+    nodes = pd.DataFrame([
+        {"node_id": 1, "lat": 0.0, "lon": 0.0},
+        {"node_id": 2, "lat": 0.0, "lon": 1.0},
+    ])
+    edges = pd.DataFrame([
+        {"u": 1, "v": 2, "distance_m": 50.0, "is_stairs": False, "is_covered_or_indoor": True, "surface_penalty": 0.6,
+         "open_mask": edge_open_mask({"opening_hours": "Mo-Fr 08:00-18:00"})},
+        {"u": 1, "v": 2, "distance_m": 80.0, "is_stairs": False, "is_covered_or_indoor": False, "surface_penalty": 0.6,
+         "open_mask": None},
+    ])
+    cg = _graph(nodes, edges)
+    cg.edge_window, cg.windows = compile_windows(edges["open_mask"])
+    lam = {"stairs": 500, "outdoor": 50, "surface": 10}
+
+    # Wednesday noon: building is open
+    _, debug, _ = dijkstra_route(cg, 1, 2, lam, False, True, departure=datetime(2025, 1, 8, 12, 0))
+    assert debug["total_distance_m"] == pytest.approx(50.0)
+
+    # Wednesday 23:00: walk around outside
+    _, debug, steps = dijkstra_route(cg, 1, 2, lam, False, True, departure=datetime(2025, 1, 8, 23, 0))
+    assert debug["total_distance_m"] == pytest.approx(80.0)
+    assert steps[0]["notes"] == []
+
+    # no departure time: hours are ignored, as before
+    _, debug, _ = dijkstra_route(cg, 1, 2, lam, False, True)
+    assert debug["total_distance_m"] == pytest.approx(50.0)
+
+
+def test_opening_hours_use_arrival_time_at_edge():
+    nodes = pd.DataFrame([
+        {"node_id": 1, "lat": 0.0, "lon": 0.0},
+        {"node_id": 2, "lat": 0.0, "lon": 1.0},
+        {"node_id": 3, "lat": 0.0, "lon": 2.0},
+    ])
+    edges = pd.DataFrame([
+        # 1680 m at 1.4 m/s is 20 minutes of walking
+        {"u": 1, "v": 2, "distance_m": 1680.0, "is_stairs": False, "is_covered_or_indoor": False, "surface_penalty": 0.6,
+         "open_mask": None},
+        {"u": 2, "v": 3, "distance_m": 10.0, "is_stairs": False, "is_covered_or_indoor": True, "surface_penalty": 0.6,
+         "open_mask": edge_open_mask({"opening_hours": "Mo-Su 07:00-22:00"})},
+    ])
+    cg = _graph(nodes, edges)
+    cg.edge_window, cg.windows = compile_windows(edges["open_mask"])
+    lam = {"stairs": 500, "outdoor": 50, "surface": 10}
+
+    path, debug, _ = dijkstra_route(cg, 1, 3, lam, False, False, departure=datetime(2025, 1, 8, 21, 30))
+    assert path == [1, 2, 3]
+    assert debug["wait_min"] == pytest.approx(0.0, abs=1e-6)
+
+    # reaching the edge at 22:05 means waiting for it to reopen at 07:00
+    path, debug, _ = dijkstra_route(cg, 1, 3, lam, False, False, departure=datetime(2025, 1, 8, 21, 45))
+    assert path == [1, 2, 3]
+    assert debug["wait_min"] == pytest.approx(8 * 60 + 55)
+
+    # an edge that never opens is skipped outright
+    cg.edge_window, cg.windows = compile_windows([None, edge_open_mask({"access": "private"})])
+    with pytest.raises(ValueError):
+        dijkstra_route(cg, 1, 3, lam, False, False, departure=datetime(2025, 1, 8, 12, 0))
+
+
+def test_overlay_closes_and_penalizes_edges():
+    nodes = pd.DataFrame([
+        {"node_id": 1, "lat": 0.0, "lon": 0.0},
+        {"node_id": 2, "lat": 0.0, "lon": 1.0},
+    ])
+    edges = pd.DataFrame([
+        {"u": 1, "v": 2, "distance_m": 50.0, "is_stairs": False, "is_covered_or_indoor": False, "surface_penalty": 0.6},
+        {"u": 1, "v": 2, "distance_m": 80.0, "is_stairs": False, "is_covered_or_indoor": False, "surface_penalty": 0.6},
+    ])
+    cg = _graph(nodes, edges)
+    lam = {"stairs": 500, "outdoor": 50, "surface": 10}
+
+    _, debug, _ = dijkstra_route(cg, 1, 2, lam, False, False, overlay={0: float("inf")})
+    assert debug["total_distance_m"] == pytest.approx(80.0)
+    assert debug["edge_rows"] == [1]
+
+    _, debug, _ = dijkstra_route(cg, 1, 2, lam, False, False, overlay={0: 20.0})
+    assert debug["total_distance_m"] == pytest.approx(50.0)
+    _, debug, _ = dijkstra_route(cg, 1, 2, lam, False, False, overlay={0: 40.0})
+    assert debug["total_distance_m"] == pytest.approx(80.0)
+
+    with pytest.raises(ValueError):
+        dijkstra_route(cg, 1, 2, lam, False, False, overlay={0: float("inf"), 1: float("inf")})
+
+
+def test_walker_waits_for_edge_that_opens_later():
+    nodes = pd.DataFrame([
+        {"node_id": 1, "lat": 0.0, "lon": 0.0},
+        {"node_id": 2, "lat": 0.0, "lon": 1.0},
+        {"node_id": 3, "lat": 0.0, "lon": 2.0},
+    ])
+    edges = pd.DataFrame([
+        # short: reaches node 2 at ~07:56, before 2->3 opens
+        {"u": 1, "v": 2, "distance_m": 100.0, "is_stairs": False, "is_covered_or_indoor": False, "surface_penalty": 0.6,
+         "open_mask": None},
+        # long: reaches node 2 at 08:15, when 2->3 is open
+        {"u": 1, "v": 2, "distance_m": 1680.0, "is_stairs": False, "is_covered_or_indoor": False, "surface_penalty": 0.6,
+         "open_mask": None},
+        {"u": 2, "v": 3, "distance_m": 10.0, "is_stairs": False, "is_covered_or_indoor": True, "surface_penalty": 0.6,
+         "open_mask": edge_open_mask({"opening_hours": "Mo-Su 08:00-22:00"})},
+    ])
+    cg = _graph(nodes, edges)
+    cg.edge_window, cg.windows = compile_windows(edges["open_mask"])
+    lam = {"stairs": 500, "outdoor": 50, "surface": 10}
+
+    path, debug, _ = dijkstra_route(cg, 1, 3, lam, False, False, departure=datetime(2025, 1, 8, 7, 55))
+
+    # a few minutes' wait on the short path beats the 20-minute detour
+    assert path == [1, 2, 3]
+    assert debug["edge_rows"] == [0, 2]
+    assert debug["wait_min"] == pytest.approx(5 - 100.0 / 84.0)
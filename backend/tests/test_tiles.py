@@ -0,0 +1,121 @@
+# backend/tests/test_tiles.py
+import math
+
+import mapbox_vector_tile
+import pandas as pd
+import pytest
+
+from backend.app import tiles
+
+
+def _tile_xy(lat: float, lon: float, z: int):
+    n = 1 << z
+    x = int((lon + 180.0) / 360.0 * n)
+    y = int((1.0 - math.asinh(math.tan(math.radians(lat))) / math.pi) / 2.0 * n)
+    return x, y
+
+
+@pytest.fixture
+def campus(make_graph):
+    # a short walk in a straight line, with one flight of stairs in the middle
+    nodes = pd.DataFrame([
+        {"node_id": 1, "lat": 39.9520, "lon": -75.1930},
+        {"node_id": 2, "lat": 39.9520, "lon": -75.1928},
+        {"node_id": 3, "lat": 39.9520, "lon": -75.1926},
+        {"node_id": 4, "lat": 39.9520, "lon": -75.1924},
+    ])
+    rows = []
+    for u, v, stairs, covered in [(1, 2, False, False), (2, 3, False, False), (3, 4, True, True)]:
+        for a, b in [(u, v), (v, u)]:
+            rows.append({"u": a, "v": b, "distance_m": 17.0, "is_stairs": stairs,
+                         "is_covered_or_indoor": covered, "surface_penalty": 0.6})
+    return make_graph(nodes, pd.DataFrame(rows), {"campus_key": "test", "generated_at": "2025-01-01T00:00:00Z"})
+
+
+def _decode(data: bytes):
+    return mapbox_vector_tile.decode(data)[tiles.LAYER_NAME]["features"]
+
+
+def test_detail_tile_carries_edge_flags_once_per_undirected_edge(campus):
+    idx = tiles.build_tile_index(campus)
+    x, y = _tile_xy(39.9520, -75.1927, 17)
+
+    features = _decode(tiles.render_tile(idx, 17, x, y))
+
+    assert len(features) == 3
+    flags = sorted((f["properties"]["is_stairs"], f["properties"]["is_covered_or_indoor"]) for f in features)
+    assert flags == [(False, False), (False, False), (True, True)]
+
+
+def test_low_zoom_tiles_are_merged_or_empty(campus):
+    idx = tiles.build_tile_index(campus)
+
+    x, y = _tile_xy(39.9520, -75.1927, 14)
+    features = _decode(tiles.render_tile(idx, 14, x, y))
+    # the two plain edges collapse into one line; the stairs edge stays separate
+    assert len(features) == 2
+
+    x, y = _tile_xy(39.9520, -75.1927, tiles.MIN_ZOOM - 1)
+    assert _decode(tiles.render_tile(idx, tiles.MIN_ZOOM - 1, x, y)) == []
+
+
+def test_tiles_are_served_from_disk_cache(campus, tmp_path, monkeypatch):
+    monkeypatch.setattr(tiles, "TILE_CACHE_DIR", tmp_path)
+    idx = tiles.build_tile_index(campus)
+    x, y = _tile_xy(39.9520, -75.1927, 17)
+
+    first = tiles.get_tile(idx, 17, x, y)
+    path = tiles.tile_cache_path(idx, 17, x, y)
+    assert path.exists()
+
+    path.write_bytes(b"cached")
+    assert tiles.get_tile(idx, 17, x, y) == b"cached"
+    assert first != b"cached"
+
+
+def test_tiles_off_campus_or_below_min_zoom_are_not_cached(campus, tmp_path, monkeypatch):
+    monkeypatch.setattr(tiles, "TILE_CACHE_DIR", tmp_path)
+    idx = tiles.build_tile_index(campus)
+    x, y = _tile_xy(39.9520, -75.1927, tiles.MIN_ZOOM - 1)
+
+    assert tiles.get_tile(idx, tiles.MIN_ZOOM - 1, x, y) == tiles.EMPTY_TILE
+    assert tiles.get_tile(idx, 20, 0, 0) == tiles.EMPTY_TILE
+    assert _decode(tiles.EMPTY_TILE) == []
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_tiles_endpoint(api):
+    x, y = _tile_xy(39.95, -75.1875, 17)
+    r = api.get(f"/tiles/demo/17/{x}/{y}")
+    assert r.status_code == 200
+    assert r.headers["content-type"] == "application/vnd.mapbox-vector-tile"
+    assert {"is_stairs", "is_covered_or_indoor"} <= set(_decode(r.content)[0]["properties"])
+
+    assert api.get("/tiles/demo/3/1/1").content == tiles.EMPTY_TILE
+    assert api.get(f"/tiles/demo/{tiles.MAX_ZOOM + 1}/0/0").status_code == 400
+    assert api.get("/tiles/demo/17/0/999999").status_code == 400
+    assert api.get(f"/tiles/nowhere/17/{x}/{y}").status_code == 404
+
+
+def test_concurrent_renders_of_one_tile_all_succeed(campus, tmp_path, monkeypatch):
+    from concurrent.futures import ThreadPoolExecutor
+
+    monkeypatch.setattr(tiles, "TILE_CACHE_DIR", tmp_path)
+    idx = tiles.build_tile_index(campus)
+    x, y = _tile_xy(39.9520, -75.1927, 17)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda _: tiles.get_tile(idx, 17, x, y), range(16)))
+
+    assert len(set(results)) == 1
+    assert [p.name for p in tiles.tile_cache_path(idx, 17, x, y).parent.iterdir()] == [f"{y}.mvt"]
+
+
+def test_tiles_endpoint_revalidates_with_etag(api):
+    x, y = _tile_xy(39.95, -75.1875, 17)
+    r = api.get(f"/tiles/demo/17/{x}/{y}")
+    etag = r.headers["etag"]
+    assert "max-age=300" in r.headers["cache-control"]
+
+    assert api.get(f"/tiles/demo/17/{x}/{y}", headers={"If-None-Match": etag}).status_code == 304
+    assert api.get(f"/tiles/demo/17/{x}/{y}", headers={"If-None-Match": '"stale"'}).status_code == 200
@@ -10,6 +10,9 @@ from shapely.ops import transform as shp_transform
 from pyproj import Transformer
 import pandas as pd
 
+# run from the repo root as a module: python -m backend.tools.build_graph ...
+from backend.app.opening_hours import edge_open_mask
+
 ox.settings.use_cache = True
 ox.settings.log_console = True
 
@@ -48,9 +51,15 @@ SURFACE_PENALTY = {
 DEFAULT_SURFACE_PENALTY = 0.6  # <- was effectively 0.0 before
 
 EDGE_KEEP_KEYS = [
-                "highway", "surface", "indoor", "covered", "lit", "wheelchair", "step_count"
+                "highway", "surface", "indoor", "covered", "lit", "wheelchair", "step_count",
+                "opening_hours", "access", "foot",
                 ]
 
+# OSMnx drops way tags it doesn't know about; keep the ones our attributes read
+ox.settings.useful_tags_way = list(dict.fromkeys(
+    list(ox.settings.useful_tags_way) + EDGE_KEEP_KEYS + ["tunnel", "arcade"]
+))
+
 # Decide if edge is stairs
 def is_stairs(tags: Dict[str, Any]) -> bool:
     hwy = tags.get("highway")
@@ -75,6 +84,13 @@ def surface_penalty(tags: Dict[str, Any]) -> float:
     surf = tags.get("surface")
     return float(SURFACE_PENALTY.get(surf, 0.8)) # unknowns mildly penalized
 
+# OSM way ids behind an edge (simplified edges can span several ways)
+def osm_way_ids(data: Dict[str, Any]) -> list:
+    ids = data.get("osmid")
+    if ids is None:
+        return []
+    return [int(w) for w in (ids if isinstance(ids, list) else [ids])]
+
 # Extract a walkable MultiDiGraph from OSM, clipped to polygon
 def build_osm_graph(poly, simplify: bool = True) -> nx.MultiDiGraph:
     # network_type='walk' grabs footways/paths/pedestrian
@@ -100,11 +116,13 @@ def normalize_graph(G: nx.MultiDiGraph) -> Tuple[pd.DataFrame, pd.DataFrame]:
         "u": u,
         "v": v,
         "key": k,
+        "osmid": osm_way_ids(data),
         "distance_m": float(data.get("length", 0.0)),
         "is_stairs": is_stairs(data),
         "is_covered_or_indoor": is_covered_or_indoor(data),
         "surface": data.get("surface"),
         "surface_penalty": surface_penalty(data),
+        "open_mask": edge_open_mask(data),  # packed weekly slots, None = always open
         "tags": json.dumps(tags, ensure_ascii=False),
         })
     edges_df = pd.DataFrame(edges)
@@ -129,6 +147,7 @@ def main():
     ap.add_argument("--key", required=True, help="campus key (e.g., mit|upenn|uh)")
     ap.add_argument("--out", required=True, help="output prefix, e.g., data/graphs/mit")
     ap.add_argument("--radius_m", type=int, default=None, help="override radius in meters")
+    ap.add_argument("--timezone", default=None, help="IANA timezone for opening hours, e.g. America/New_York")
     args = ap.parse_args()
 
     campuses = json.load(open(args.campuses))
@@ -138,6 +157,9 @@ def main():
 
     c = campuses[args.key]
     radius = args.radius_m or c["radius_m"]
+    tz = args.timezone or c.get("timezone")
+    if not tz:
+        print("Warning: no timezone given; /route will only accept departure times without an offset")
 
     print(f"Building graph for {c['name']} with radius {radius} m ...")
     poly = circle_polygon(c["lat"], c["lon"], radius)
@@ -152,6 +174,7 @@ def main():
     "campus_name": c["name"],
     "center": {"lat": c["lat"], "lon": c["lon"]},
     "radius_m": radius,
+    "timezone": tz,
     "generated_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
     "counts": {"nodes": int(len(nodes_df)), "edges": int(len(edges_df))},
     "notes": {
@@ -1,14 +1,57 @@
 import json
-import time
 import requests
+from datetime import datetime
+from zoneinfo import ZoneInfo
 import pandas as pd
 import streamlit as st
 from pathlib import Path
 from streamlit_folium import st_folium
 import folium
+from requests.adapters import HTTPAdapter
 
 API_BASE = st.secrets.get("API_BASE", "http://127.0.0.1:8000")
 DATA_DIR = Path("data/graphs")
+ROUTE_TIMEOUT_S = 20
+
+
+# --- Cached resources (survive Streamlit reruns) ---
+@st.cache_resource
+def get_http_session() -> requests.Session:
+    # one pooled keep-alive session per server process, so reroutes skip TCP setup
+    s = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+    s.mount("http://", adapter)
+    s.mount("https://", adapter)
+    return s
+
+
+@st.cache_data(show_spinner=False)
+def load_campus_center(nodes_path: str, mtime: float) -> tuple:
+    # mtime is part of the cache key: rebuilding the parquet invalidates the entry
+    nodes = pd.read_parquet(nodes_path, columns=["lat", "lon"])
+    return float(nodes["lat"].mean()), float(nodes["lon"].mean())
+
+
+@st.cache_data(show_spinner=False)
+def load_campus_timezone(meta_path: str, mtime: float):
+    # None for graphs built without a timezone
+    with open(meta_path) as f:
+        return json.load(f).get("timezone")
+
+
+def fetch_route(payload_json: str) -> dict:
+    # not memoized here: the server caches routes and invalidates them when closures change
+    r = get_http_session().post(
+        f"{API_BASE}/route",
+        data=payload_json,
+        headers={"Content-Type": "application/json"},
+        timeout=ROUTE_TIMEOUT_S,
+    )
+    # capture server message if not OK
+    if not r.ok:
+        raise RuntimeError(f"({r.status_code}) {r.text}")
+    return r.json()
+
 
 st.set_page_config(page_title="Navigator Viewer", layout="wide")
 st.title("Navigator — Map Viewer")
@@ -23,12 +66,14 @@ max_distance_m = st.sidebar.slider("Max distance (m)", 200, 4000, 1500, 50)
 lam_stairs = st.sidebar.slider("λ_stairs", 0, 2000, 500, 10)
 lam_outdoor = st.sidebar.slider("λ_outdoor", 0, 200, 50, 5)
 lam_surface = st.sidebar.slider("λ_surface", 0, 50, 10, 1)
+use_hours = st.sidebar.checkbox("Respect building opening hours", True)
+auto_route = st.sidebar.checkbox("Re-route when preferences change", True)
 
-# --- Load nodes to get center & bounds quickly (no heavy viz) ---
+# --- Map center (cached per campus, re-read only when the parquet changes) ---
 nodes_path = DATA_DIR / f"{campus_key}.nodes.parquet"
-nodes = pd.read_parquet(nodes_path)
-center_lat = float(nodes["lat"].mean())
-center_lon = float(nodes["lon"].mean())
+center_lat, center_lon = load_campus_center(str(nodes_path), nodes_path.stat().st_mtime)
+meta_path = DATA_DIR / f"{campus_key}.meta.json"
+campus_tz = load_campus_timezone(str(meta_path), meta_path.stat().st_mtime)
 
 
 col_map, col_info = st.columns([3, 2], gap="large")
@@ -39,6 +84,7 @@ for k, v in {
     "dst": None,
     "last_resp": None,
     "last_error": None,
+    "last_payload": None,
 }.items():
     if k not in st.session_state:
         st.session_state[k] = v
@@ -85,15 +131,19 @@ with col_info:
     c1, c2, c3 = st.columns(3)
     if c1.button("Clear Source"):
         st.session_state.src = None
+        st.session_state.last_payload = None
     if c2.button("Clear Target"):
         st.session_state.dst = None
+        st.session_state.last_payload = None
     if c3.button("Clear Both"):
         st.session_state.src = None; st.session_state.dst = None
+        st.session_state.last_payload = None
 
     can_route = st.session_state.src and st.session_state.dst
     go = st.button("Compute Route", type="primary", disabled=not can_route)
 
-    if go and can_route:
+    payload_json = None
+    if can_route:
         payload = {
             "campus_key": campus_key,
             "source": {"lat": st.session_state.src[0], "lon": st.session_state.src[1]},
@@ -105,20 +155,34 @@ with col_info:
                 "lambda": {"stairs": lam_stairs, "outdoor": lam_outdoor, "surface": lam_surface}
             }
         }
+        if use_hours:
+            # floor to the server's 15-minute slots so the payload (and route cache key) is stable
+            # campus time with its offset when the graph knows its timezone; otherwise a naive
+            # local time, which the server reads as campus-local instead of rejecting it
+            now = datetime.now(ZoneInfo(campus_tz)) if campus_tz else datetime.now()
+            now = now.replace(second=0, microsecond=0)
+            payload["departure_time"] = now.replace(minute=now.minute - now.minute % 15).isoformat()
+        payload_json = json.dumps(payload, sort_keys=True)
+
+    # debounce: only re-route on a rerun whose payload actually differs from the last routed one
+    prefs_changed = (
+        auto_route
+        and st.session_state.last_payload is not None
+        and payload_json is not None
+        and payload_json != st.session_state.last_payload
+    )
+
+    if can_route and (go or prefs_changed):
         st.session_state.last_resp = None
         st.session_state.last_error = None
-        t0 = time.time()
+        st.session_state.last_payload = payload_json
         with st.spinner("Routing…"):
             try:
-                r = requests.post(f"{API_BASE}/route", json=payload, timeout=20)
-                # capture server message if not OK
-                if not r.ok:
-                    st.session_state.last_error = f"({r.status_code}) {r.text}"
-                else:
-                    st.session_state.last_resp = r.json()
+                st.session_state.last_resp = fetch_route(payload_json)
             except Exception as e:
                 st.session_state.last_error = str(e)
-        st.rerun()  # persist and redraw
+        if go:
+            st.rerun()  # persist and redraw
 
     # ---- Persisted output (shown on every rerun) ----
     if st.session_state.last_error: